@@ -0,0 +1,85 @@
+"""Behavior checks for request tier classification and tier statistics.
+
+Run with: python -m pytest test_voice_assistant.py
+"""
+import contextlib
+import io
+
+from benchmark import FakeMicrophone, FakeRecognizer, NullTTSEngine
+from voice_assistant import AdvancedVoiceAssistant, DEFAULT_REQUEST_TIERS
+
+# Expected request tiers as (utterance, tier without history, tier right after an exchange)
+TIER_CASES = [
+    ("what is the capital of france", "quick", "quick"),
+    ("is it raining in paris", "quick", "quick"),
+    ("how many ounces are in a pound", "quick", "quick"),
+    ("what is it", "quick", "standard"),
+    ("why is that", "standard", "standard"),
+    ("what about tomorrow", "standard", "standard"),
+    ("how do you feel today", "standard", "standard"),
+    ("how do you do", "standard", "standard"),
+    ("tell me about yourself", "standard", "standard"),
+    ("set a reminder for my dentist appointment", "standard", "standard"),
+    ("why do i", "standard", "standard"),
+    ("explain how black holes form", "detailed", "detailed"),
+    ("explain recursion", "detailed", "detailed"),
+    ("describe photosynthesis", "detailed", "detailed"),
+    ("how does a jet engine work", "detailed", "detailed"),
+    ("how do i change a tire", "detailed", "detailed"),
+    ("how do we reduce emissions", "detailed", "detailed"),
+    ("why do i get headaches", "detailed", "detailed"),
+    ("how do you make pasta", "detailed", "detailed"),
+    ("walk me through baking sourdough step by step", "detailed", "detailed"),
+]
+
+
+def make_assistant(request_tiers=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AdvancedVoiceAssistant(
+            "orin",
+            request_tiers=request_tiers,
+            microphone=FakeMicrophone(),
+            recognizer=FakeRecognizer(),
+            tts_engine=NullTTSEngine()
+        )
+
+
+def test_tiers_without_history():
+    assistant = make_assistant()
+    for utterance, expected, _ in TIER_CASES:
+        assert assistant.classify_request(utterance) == expected, utterance
+
+
+def test_tiers_after_recent_exchange():
+    assistant = make_assistant()
+    assistant.add_to_conversation_history("what is the weather like", "It's sunny and 20 degrees.")
+    for utterance, _, expected in TIER_CASES:
+        assert assistant.classify_request(utterance) == expected, utterance
+
+
+def test_missing_tier_falls_back_to_standard():
+    tiers = {name: config for name, config in DEFAULT_REQUEST_TIERS.items() if name != "detailed"}
+    assistant = make_assistant(tiers)
+    assert assistant.classify_request("explain how black holes form") == "standard"
+
+
+def test_instance_tiers_do_not_change_defaults():
+    assistant = make_assistant()
+    assistant.request_tiers.pop("detailed")
+    assistant.request_tiers["quick"]["max_tokens"] = 1
+    assert "detailed" in DEFAULT_REQUEST_TIERS
+    assert DEFAULT_REQUEST_TIERS["quick"]["max_tokens"] != 1
+
+
+def test_failed_requests_kept_out_of_success_averages():
+    assistant = make_assistant()
+    assistant.record_tier_stats("quick", 0.5, {"prompt_tokens": 40, "completion_tokens": 20})
+    assistant.record_tier_stats("quick", 10.0, error=True)
+    assistant.record_tier_stats("quick", 1.5, None)
+
+    stats = assistant.tier_stats["quick"]
+    assert stats["successes"] == 2
+    assert stats["errors"] == 1
+    assert stats["success_latency"] == 2.0
+    assert stats["error_latency"] == 10.0
+    assert stats["completion_tokens"] == 20
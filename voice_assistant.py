@@ -2,6 +2,7 @@ import speech_recognition as sr
 import pyttsx3
 import threading
 import time
+import copy
 import datetime
 import webbrowser
 import os
@@ -17,20 +18,54 @@ from typing import List, Dict, Any
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Request tiers for OpenAI calls: each utterance is classified locally and
+# sent with the model, token budget and context window of its tier.
+DEFAULT_REQUEST_TIERS = {
+    "quick": {
+        "model": "gpt-3.5-turbo",
+        "max_tokens": 60,
+        "temperature": 0.7,
+        "context_exchanges": 1
+    },
+    "standard": {
+        "model": "gpt-3.5-turbo",
+        "max_tokens": 150,
+        "temperature": 0.7,
+        "context_exchanges": 3
+    },
+    "detailed": {
+        "model": "gpt-4o-mini",
+        "max_tokens": 400,
+        "temperature": 0.7,
+        "context_exchanges": 5
+    }
+}
+
 class AdvancedVoiceAssistant:
-    def __init__(self, assistant_name="orin", openai_api_key=None):
-        """Initialize the Advanced Voice Assistant with AI capabilities."""
+    def __init__(self, assistant_name="orin", openai_api_key=None, request_tiers=None,
+                 microphone=None, recognizer=None, tts_engine=None,
+                 openai_api_base="https://api.openai.com/v1"):
+        """Initialize the Advanced Voice Assistant with AI capabilities.
+
+        The microphone, recognizer and TTS engine default to the real
+        speech_recognition/pyttsx3 backends but can be injected (e.g. fakes
+        for benchmarking). openai_api_base may point at any
+        OpenAI-compatible server.
+        """
         self.assistant_name = assistant_name.lower()
         self.wake_words = [self.assistant_name, f"hey {self.assistant_name}", f"ok {self.assistant_name}"]
         
         # OpenAI Configuration
         self.openai_api_key = openai_api_key
         self.use_openai = openai_api_key is not None
+        self.openai_api_base = openai_api_base.rstrip("/")
+        self.request_tiers = copy.deepcopy(request_tiers or DEFAULT_REQUEST_TIERS)
+        self.tier_stats = {tier: self.new_tier_stats() for tier in self.request_tiers}
         
         # Initialize speech recognition and TTS
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.tts_engine = pyttsx3.init()
+        self.recognizer = recognizer if recognizer is not None else sr.Recognizer()
+        self.microphone = microphone if microphone is not None else sr.Microphone()
+        self.tts_engine = tts_engine if tts_engine is not None else pyttsx3.init()
         
         # Conversation context and memory
         self.conversation_history = []
@@ -124,13 +159,13 @@ class AdvancedVoiceAssistant:
             if len(self.conversation_history) > 20:
                 self.conversation_history = self.conversation_history[-20:]
 
-    def get_conversation_context(self) -> str:
+    def get_conversation_context(self, max_exchanges: int = 5) -> str:
         """Get recent conversation context for AI responses."""
-        if not self.conversation_history:
+        if not self.conversation_history or max_exchanges <= 0:
             return ""
         
         context_parts = []
-        recent_conversations = self.conversation_history[-5:]  # Last 5 exchanges
+        recent_conversations = self.conversation_history[-max_exchanges:]
         
         for conv in recent_conversations:
             context_parts.append(f"User: {conv['user']}")
@@ -138,14 +173,122 @@ class AdvancedVoiceAssistant:
         
         return "\n".join(context_parts)
 
+    def is_follow_up(self, command: str) -> bool:
+        """Detect whether a command refers back to the recent conversation."""
+        if not self.conversation_history:
+            return False
+        
+        # Only treat it as a follow-up while the conversation is still fresh
+        last_exchange = datetime.datetime.fromisoformat(self.conversation_history[-1]["timestamp"])
+        if (datetime.datetime.now() - last_exchange).total_seconds() > 120:
+            return False
+        
+        follow_up_starts = ['and ', 'what about', 'how about', 'what else', 'tell me more', 'more ', 'also ', 'then ']
+        reference_words = ['it', 'that', 'this', 'they', 'them', 'those', 'he', 'she', 'there']
+        
+        if any(command.startswith(start) for start in follow_up_starts):
+            return True
+        
+        # Pronoun references only count when the command opens with one or is
+        # little more than one ("why is that", "what is it")
+        words = command.split()
+        if not words:
+            return False
+        return words[0] in reference_words or (len(words) <= 3 and words[-1] in reference_words)
+
+    def classify_request(self, command: str) -> str:
+        """Pick a request tier from cheap local features of the command."""
+        command_lower = command.lower().strip()
+        word_count = len(command_lower.split())
+        
+        # Imperatives are detailed on their own ("explain recursion"); question
+        # openers need a subject and a verb after them ("how do magnets work")
+        detailed_imperatives = ['explain', 'describe', 'compare', 'summarize', 'tell me about', 'walk me through']
+        detailed_questions = ["what's the difference between", 'what is the difference between',
+                              'how does', 'how do', 'why does', 'why do']
+        detailed_phrases = ['step by step', 'in detail']
+        quick_phrases = ['what is', "what's", 'who is', "who's", 'when is', 'when was', 'where is',
+                         'how many', 'how much', 'define', 'spell', 'is it', 'are you', 'do you']
+        small_talk_phrases = ['how do you feel', 'how do you like', 'tell me about yourself',
+                              'describe yourself', 'explain yourself']
+        
+        command_text = command_lower.rstrip('?!. ')
+        is_small_talk = (command_text == 'how do you do'
+                         or any(command_text.startswith(phrase) for phrase in small_talk_phrases))
+        
+        is_detailed_question = False
+        if not is_small_talk:
+            for opener in detailed_imperatives + detailed_questions:
+                if command_text.startswith(opener + " "):
+                    words_after = len(command_text[len(opener):].split())
+                    is_detailed_question = opener in detailed_imperatives or words_after >= 2
+                    break
+        
+        if (is_detailed_question or word_count > 20
+                or any(phrase in command_lower for phrase in detailed_phrases)):
+            tier = "detailed"
+        elif self.is_follow_up(command_lower):
+            tier = "standard"
+        elif word_count <= 8 and any(command_lower.startswith(phrase) for phrase in quick_phrases):
+            tier = "quick"
+        else:
+            tier = "standard"
+        
+        # Fall back gracefully when a custom tier table omits a tier
+        if tier not in self.request_tiers:
+            tier = "standard" if "standard" in self.request_tiers else next(iter(self.request_tiers))
+        return tier
+
+    @staticmethod
+    def new_tier_stats() -> Dict[str, Any]:
+        """Empty per-tier statistics record."""
+        return {"successes": 0, "errors": 0, "success_latency": 0.0, "error_latency": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0}
+
+    def record_tier_stats(self, tier: str, latency: float, usage: Dict[str, Any] = None, error: bool = False):
+        """Track per-tier latency, token usage and failures for tuning the tier table.
+
+        Failed requests are kept apart so timeouts do not skew the averages
+        of successful requests.
+        """
+        stats = self.tier_stats.setdefault(tier, self.new_tier_stats())
+        
+        if error:
+            stats["errors"] += 1
+            stats["error_latency"] += latency
+            logger.info(
+                f"OpenAI tier '{tier}': failed after {latency:.2f}s "
+                f"({stats['errors']} errors, avg {stats['error_latency'] / stats['errors']:.2f}s)"
+            )
+            return
+        
+        usage = usage or {}
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        stats["successes"] += 1
+        stats["success_latency"] += latency
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        
+        logger.info(
+            f"OpenAI tier '{tier}': {latency:.2f}s, {prompt_tokens} prompt / {completion_tokens} completion tokens "
+            f"(avg {stats['success_latency'] / stats['successes']:.2f}s, "
+            f"avg {stats['completion_tokens'] / stats['successes']:.0f} completion tokens "
+            f"over {stats['successes']} successful requests, {stats['errors']} errors)"
+        )
+
     def get_openai_response(self, user_input: str) -> str:
         """Get response from OpenAI GPT API."""
         if not self.use_openai:
             return None
         
         try:
+            # Pick model, token budget and context size for this request
+            tier = self.classify_request(user_input)
+            tier_config = self.request_tiers[tier]
+            
             # Build conversation context
-            context = self.get_conversation_context()
+            context = self.get_conversation_context(tier_config.get("context_exchanges", 5))
             current_time = datetime.datetime.now().strftime("%A, %B %d, %Y at %I:%M %p")
             
             # Create system prompt based on personality
@@ -171,26 +314,36 @@ Recent conversation context:
             }
             
             data = {
-                "model": "gpt-3.5-turbo",
+                "model": tier_config.get("model", "gpt-3.5-turbo"),
                 "messages": [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_input}
                 ],
-                "max_tokens": 150,
-                "temperature": 0.7
+                "max_tokens": tier_config.get("max_tokens", 150),
+                "temperature": tier_config.get("temperature", 0.7)
             }
             
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=10
-            )
+            request_start = time.time()
+            try:
+                response = requests.post(
+                    f"{self.openai_api_base}/chat/completions",
+                    headers=headers,
+                    json=data,
+                    timeout=10
+                )
+            except requests.RequestException:
+                # Timeouts and connection errors are part of the tier's latency tail
+                self.record_tier_stats(tier, time.time() - request_start, error=True)
+                raise
+            latency = time.time() - request_start
             
             if response.status_code == 200:
                 result = response.json()
-                return result['choices'][0]['message']['content'].strip()
+                reply = result['choices'][0]['message']['content'].strip()
+                self.record_tier_stats(tier, latency, result.get('usage') or {})
+                return reply
             else:
+                self.record_tier_stats(tier, latency, error=True)
                 logger.error(f"OpenAI API error: {response.status_code}")
                 return None
                 